@@ -11,4 +11,6 @@ if [ "$COMMAND" = "run" ]; then
   adk web
 elif [ "$COMMAND" = "server" ]; then
   adk api_server
+elif [ "$COMMAND" = "precompute" ]; then
+  python -m hsn_agent.answer_table
 fi
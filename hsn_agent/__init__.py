@@ -1,2 +1,8 @@
-from .import agent
-# from .import agent_full_code
\ No newline at end of file
+# Import the agent lazily so offline scripts such as `python -m hsn_agent.answer_table`
+# do not build the Agent and Runner. ADK finds `hsn_agent.agent.root_agent` on its own.
+def __getattr__(name):
+    if name == "agent":
+        from . import agent
+        return agent
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+# from .import agent_full_code
@@ -0,0 +1,82 @@
+from typing import List, Dict, Union, Any, Optional, Iterable
+from collections import Counter
+from logging.handlers import MemoryHandler, RotatingFileHandler
+import logging
+import os
+
+# Access log used to decide which answers the offline answer table should precompute.
+# Retention: the log rotates at ACCESS_LOG_MAX_BYTES and keeps ACCESS_LOG_BACKUPS old files,
+# so at most (1 + ACCESS_LOG_BACKUPS) * ACCESS_LOG_MAX_BYTES (~20 MB) is kept on disk.
+ACCESS_LOG_MAX_BYTES = 5 * 1024 * 1024
+ACCESS_LOG_BACKUPS = 3
+# Records are buffered in memory and written in batches (and on interpreter exit)
+ACCESS_LOG_BUFFER_RECORDS = 200
+
+script_dir = os.path.dirname(__file__)
+access_log_path = os.environ.get(
+    "HSN_ACCESS_LOG",
+    os.path.abspath(os.path.join(script_dir, "..", "logs", "hsn_access.log")),
+)
+
+
+# --- set up the buffered, rotating access logger ---
+def _build_access_logger() -> logging.Logger:
+    access_logger = logging.getLogger("hsn_agent.access")
+    access_logger.setLevel(logging.INFO)
+    access_logger.propagate = False
+    if access_logger.handlers:
+        return access_logger
+
+    try:
+        os.makedirs(os.path.dirname(access_log_path), exist_ok=True)
+    except OSError as e:
+        print(f"--- WARNING: Could not create access log directory for '{access_log_path}': {e} ---")
+        access_logger.addHandler(logging.NullHandler())
+        return access_logger
+
+    file_handler = RotatingFileHandler(
+        access_log_path, maxBytes=ACCESS_LOG_MAX_BYTES, backupCount=ACCESS_LOG_BACKUPS,
+        encoding="utf-8", delay=True,
+    )
+    file_handler.setFormatter(logging.Formatter("%(message)s"))
+    # flushLevel above CRITICAL: flush only when the buffer is full or logging shuts down
+    access_logger.addHandler(MemoryHandler(
+        ACCESS_LOG_BUFFER_RECORDS, flushLevel=logging.CRITICAL + 1, target=file_handler,
+    ))
+    return access_logger
+
+
+access_logger = _build_access_logger()
+
+
+# --- record requested codes in the access log ---
+def record_hsn_access(codes: Iterable[str], intent: str = "validate") -> None:
+    """
+    Records one '<intent>\\t<code>' line per requested code in the access log.
+    Writes are buffered; logging failures never break the validation flow.
+    """
+    for code in codes:
+        if code:
+            access_logger.info("%s\t%s", intent, code)
+
+
+# --- count requests per (intent, code) ---
+def count_hsn_access(log_path: str = access_log_path) -> Counter:
+    """
+    Reads the access log and its rotated backups line by line and counts how often
+    each (intent, code) pair was requested. Returns an empty Counter if no log exists.
+    """
+    counts: Counter = Counter()
+    log_files = [log_path] + [f"{log_path}.{index}" for index in range(1, ACCESS_LOG_BACKUPS + 1)]
+    log_files = [path for path in log_files if os.path.exists(path)]
+    if not log_files:
+        print(f"--- No access log found at '{log_path}'. ---")
+        return counts
+
+    for path in log_files:
+        with open(path, encoding="utf-8") as log_file:
+            for line in log_file:
+                intent, _, code = line.strip().partition("\t")
+                if code:
+                    counts[(intent, code)] += 1
+    return counts
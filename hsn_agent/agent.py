@@ -3,7 +3,7 @@ from google.genai import types
 from google.adk.agents import Agent
 from google.adk.runners import Runner
 from google.adk.sessions import InMemorySessionService
-from .callback import block_hsn_code_tool_guardrail, block_keyword_model_guardrail
+from .callback import block_hsn_code_tool_guardrail, precomputed_answer_model_callback, condense_long_message_model_callback
 from .tool import hsn_code_validation_tool
 from .prompt import description, instruction
 from dotenv import load_dotenv
@@ -27,7 +27,7 @@ root_agent = Agent(
     instruction=instruction, 
     tools=[hsn_code_validation_tool],
     output_key="hsn_agent_last_response",
-    before_model_callback=block_keyword_model_guardrail, 
+    before_model_callback=[precomputed_answer_model_callback, condense_long_message_model_callback], 
     before_tool_callback=block_hsn_code_tool_guardrail
 )
 print("\n--- Agent configuration complete. Ready for 'adk web' command. ---")
@@ -0,0 +1,153 @@
+from typing import List, Dict, Union, Any, Optional
+from collections import defaultdict
+import argparse
+import hashlib
+import json
+import os
+import re
+from .data_loader import hsn_master_data
+from .access_log import access_log_path, count_hsn_access
+from .tool import BLOCKED_HSN_PREFIXES, validate_hsn_code
+
+DEFAULT_TOP_N = 500
+MAX_LISTED_CHILDREN = 100
+FOLLOW_UP = "\n\nWould you like to check another HSN code? 😊"
+
+# Single-intent user messages the table can answer without the LLM
+QUERY_PATTERNS = [
+    ("chapter", re.compile(r"(?:what is|what's|describe|show|tell me about)?\s*(?:hsn\s+)?chapter\s+(\d{1,2})")),
+    ("headings", re.compile(r"(?:list|show)(?:\s+all|\s+the)?\s+headings\s+(?:under|in|of|for)(?:\s+chapter)?\s+(\d{1,2})")),
+    ("heading", re.compile(r"(?:what is|what's|describe|show|tell me about)?\s*(?:hsn\s+)?heading\s+(\d{4})")),
+    ("validate", re.compile(r"(?:is|check|validate)\s+(?:hsn\s+)?(?:code\s+)?(\d{2}|\d{4}|\d{6}|\d{8})(?:\s+(?:a\s+)?valid)?")),
+]
+
+
+# --- render answers the same way the agent would present tool results ---
+def render_validation_answer(result: Dict[str, Any]) -> str:
+    """Renders a validate_hsn_code result as a user-facing answer."""
+    code = result["input_hsn"]
+    if result["is_valid"]:
+        return f"✅ HSN code {code} is valid.\nDescription: {result['description']}{FOLLOW_UP}"
+    return f"❌ HSN code {code} is not valid. {result['message']}{FOLLOW_UP}"
+
+
+def _render_listing(title: str, children: List[str], master: Dict[str, str]) -> str:
+    lines = [title]
+    lines += [f"- {child}: {master[child]}" for child in children[:MAX_LISTED_CHILDREN]]
+    if len(children) > MAX_LISTED_CHILDREN:
+        lines.append(f"...and {len(children) - MAX_LISTED_CHILDREN} more.")
+    return "\n".join(lines) + FOLLOW_UP
+
+
+# --- fingerprint the master data ---
+def master_fingerprint(master: Dict[str, str]) -> str:
+    """Returns a SHA-256 hash of the sorted (code, description) pairs of the master data."""
+    digest = hashlib.sha256()
+    for code in sorted(master):
+        digest.update(f"{code}\t{master[code]}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+# --- build the answer table ---
+def build_answer_table(master: Dict[str, str], log_path: str = access_log_path, top_n: int = DEFAULT_TOP_N) -> Dict[str, Any]:
+    """
+    Materializes rendered answers keyed by '<intent>:<code>'. Chapter summaries and
+    heading listings are built for every chapter; validation answers and heading
+    summaries only for the `top_n` most requested entries in the access log.
+    Codes with a blocked prefix (BLOCKED_HSN_PREFIXES) are never precomputed.
+    """
+    headings_by_chapter = defaultdict(list)
+    children_by_heading = defaultdict(list)
+    codes_per_chapter = defaultdict(int)
+    for code in sorted(master):
+        if len(code) == 2:
+            continue
+        codes_per_chapter[code[:2]] += 1
+        if len(code) == 4:
+            headings_by_chapter[code[:2]].append(code)
+        else:
+            children_by_heading[code[:4]].append(code)
+
+    answers: Dict[str, str] = {}
+    for chapter in (code for code in master if len(code) == 2):
+        headings = headings_by_chapter[chapter]
+        answers[f"chapter:{chapter}"] = (
+            f"ℹ️ Chapter {chapter}: {master[chapter]}\n"
+            f"It has {len(headings)} headings and {codes_per_chapter[chapter]} codes in total."
+            f"{FOLLOW_UP}"
+        )
+        answers[f"headings:{chapter}"] = _render_listing(
+            f"ℹ️ Chapter {chapter} ({master[chapter]}) has {len(headings)} headings:", headings, master
+        )
+
+    for (intent, code), _ in count_hsn_access(log_path).most_common(top_n):
+        # Policy-blocked codes must always go through block_hsn_code_tool_guardrail
+        if code.startswith(BLOCKED_HSN_PREFIXES):
+            continue
+        if intent == "validate":
+            answers[f"validate:{code}"] = render_validation_answer(validate_hsn_code(code))
+        # Popular 4-digit validations also seed heading summaries
+        if intent in {"validate", "heading"} and len(code) == 4 and code in master:
+            children = children_by_heading[code]
+            answers[f"heading:{code}"] = _render_listing(
+                f"ℹ️ Heading {code}: {master[code]}\nIt has {len(children)} sub-codes:", children, master
+            )
+
+    return {"master_fingerprint": master_fingerprint(master), "answers": answers}
+
+
+# --- load the answer table ---
+def load_answer_table(table_path: str, master: Dict[str, str]) -> Dict[str, str]:
+    """
+    Loads precomputed answers from disk. Returns an empty table if the file is
+    missing or was built against a different master data set.
+    """
+    if not os.path.exists(table_path):
+        print(f"--- No answer table found at '{table_path}'. All queries will go to the LLM. ---")
+        return {}
+
+    try:
+        with open(table_path, encoding="utf-8") as table_file:
+            table = json.load(table_file)
+    except (OSError, ValueError) as e:
+        print(f"--- WARNING: Could not read answer table '{table_path}': {e} ---")
+        return {}
+
+    if table.get("master_fingerprint") != master_fingerprint(master):
+        print("--- WARNING: Answer table is stale (built for a different master data set). Ignoring it. ---")
+        return {}
+
+    answers = table.get("answers", {})
+    print(f"--- Loaded {len(answers)} precomputed answers. ---")
+    return answers
+
+
+# --- map a user message to a table key ---
+def match_answer_key(message: str) -> Optional[str]:
+    """Returns the '<intent>:<code>' key for a single-intent message, or None."""
+    text = " ".join(message.lower().split()).rstrip("?.! ")
+    for intent, pattern in QUERY_PATTERNS:
+        match = pattern.fullmatch(text)
+        if match:
+            code = match.group(1)
+            return f"{intent}:{code.zfill(2) if intent in {'chapter', 'headings'} else code}"
+    return None
+
+
+# Load the answer table into a global variable, next to the master data.
+script_dir = os.path.dirname(__file__)
+table_path = os.path.abspath(os.path.join(script_dir, "..", "data", "answer_table.json"))
+answer_table = load_answer_table(table_path, hsn_master_data)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Precompute the HSN answer table from the master data and access log.")
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP_N, help="Number of most requested entries to precompute.")
+    parser.add_argument("--log", default=access_log_path, help="Path to the access log.")
+    parser.add_argument("--output", default=table_path, help="Where to write the answer table.")
+    args = parser.parse_args()
+
+    table = build_answer_table(hsn_master_data, args.log, args.top)
+    with open(args.output, "w", encoding="utf-8") as table_file:
+        json.dump(table, table_file, ensure_ascii=False, separators=(",", ":"))
+    print(f"--- Wrote {len(table['answers'])} precomputed answers to '{args.output}'. ---")
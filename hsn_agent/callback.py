@@ -6,6 +6,10 @@ from google.adk.models.llm_response import LlmResponse
 from google.genai import types
 from typing import List, Dict, Union, Any, Optional
 import random 
+from .answer_table import answer_table, match_answer_key
+from .access_log import record_hsn_access
+from .code_extractor import condense_long_message
+from .tool import BLOCKED_HSN_PREFIXES
 
 
 # --- Initialize Callback for model and tool ---
@@ -59,6 +63,66 @@ def block_keyword_model_guardrail(
     return None # Returning None signals ADK to continue normally
 
 
+# callback for serving precomputed answers
+def precomputed_answer_model_callback(
+    callback_context: CallbackContext, llm_request: LlmRequest
+) -> Optional[LlmResponse]:
+    """
+    Runs the keyword guardrail, then answers the latest user message straight from the
+    precomputed answer table when it can. Returns None to let the LLM handle the query.
+    """
+    guardrail_response = block_keyword_model_guardrail(callback_context, llm_request)
+    if guardrail_response:
+        return guardrail_response
+
+    # Only answer fresh user turns, not follow-up calls after a tool response
+    if not llm_request.contents:
+        return None
+    last_content = llm_request.contents[-1]
+    if last_content.role != 'user' or not last_content.parts or not last_content.parts[0].text:
+        return None
+
+    answer_key = match_answer_key(last_content.parts[0].text)
+    answer = answer_table.get(answer_key) if answer_key else None
+    if not answer:
+        return None
+
+    print(f"--- Callback: Serving precomputed answer '{answer_key}'. Skipping LLM call. ---")
+    intent, _, code = answer_key.partition(":")
+    record_hsn_access([code], intent=intent)
+    callback_context.state["precomputed_answer_key"] = answer_key
+
+    return LlmResponse(
+        content=types.Content(
+            role="model",
+            parts=[types.Part(text=answer)],
+        )
+    )
+
+
+# callback for condensing long user messages
+def condense_long_message_model_callback(
+    callback_context: CallbackContext, llm_request: LlmRequest
+) -> Optional[LlmResponse]:
+    """
+    Replaces long user messages (pasted invoices, spreadsheet dumps) in the request
+    with a short preview and the pre-validated HSN codes extracted from them, so the
+    LLM does not have to read the raw text. Always returns None to proceed.
+    """
+    for content in llm_request.contents or []:
+        if content.role != 'user' or not content.parts:
+            continue
+        for part in content.parts:
+            if not part.text:
+                continue
+            condensed_text = condense_long_message(part.text)
+            if condensed_text:
+                print(f"--- Callback: Condensed a {len(part.text)}-character user message for the LLM. ---")
+                part.text = condensed_text
+
+    return None
+
+
 # callback for tool
 def block_hsn_code_tool_guardrail(
     tool: BaseTool, args: Dict[str, Any], tool_context: ToolContext
@@ -85,7 +149,7 @@ def block_hsn_code_tool_guardrail(
     blocked_codes = []
 
     for code in hsn_codes_to_check:
-        if isinstance(code, str) and code.strip().startswith("12345"):
+        if isinstance(code, str) and code.strip().startswith(BLOCKED_HSN_PREFIXES):
             blocked_codes.append(code.strip())
         else:
             unblocked_codes.append(code.strip())
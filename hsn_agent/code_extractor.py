@@ -0,0 +1,142 @@
+from typing import List, Dict, Union, Any, Optional
+import re
+from .data_loader import hsn_master_data
+from .tool import BLOCKED_HSN_PREFIXES, validate_hsn_code
+
+# Messages at least this long are condensed before the LLM call
+LONG_MESSAGE_CHARS = 1000
+# The start and end of a condensed message are kept verbatim (the request and any follow-up question)
+MESSAGE_HEAD_CHARS = 200
+MESSAGE_TAIL_CHARS = 300
+# Statuses worth passing on to 'hsn_code_validation_tool'
+TOOL_READY_STATUSES = {"VALID", "NOT_FOUND_BUT_PARENT_EXISTS"}
+
+# 4-digit heading with up to two 2-digit groups split by a space, dot or dash, or a contiguous code
+_CODE = r"\d{4}(?:[ .\-]\d{2}){1,2}|\d{8}|\d{6}|\d{4}"
+# Digits glued to letters or other digits (IDs like GSTINs), decimals and thousands
+# groups ('1200,000', '4521/2024') are not codes. A comma followed by 4+ digits
+# is a list separator, so '8471,8528' still yields both codes.
+_CODE_END = r"(?!\w|[./\-]\d|,\d{3}(?!\d))"
+
+# One pattern, one left-to-right pass over the text:
+#  - a code or 2-digit chapter after an 'HSN'/'SAC'/'chapter' label ('HSN Code: 8471 30 10', 'hsn-8471', 'chapter 85')
+#  - an unlabelled code, e.g. in an invoice column or a comma-separated list
+HSN_CODE_PATTERN = re.compile(
+    rf"\b(?:chapter|hsn|sac|hs)(?:\s*/\s*sac)?(?:\s+code)?[\s:#\-]*"
+    rf"(?:(?P<chapter>\d{{2}})(?!\d)|(?P<labelled>{_CODE}){_CODE_END})"
+    rf"|(?<![\w./\-])(?P<code>{_CODE}){_CODE_END}",
+    re.IGNORECASE,
+)
+
+# Text just before an unlabelled dotted number that marks it as money ('Rate 8504.00', 'Rs. 8471.50')
+MONEY_CONTEXT = re.compile(
+    r"(?:[₹$€£]|\b(?:rs|inr|usd|eur|price|rate|amount|amt|total|subtotal|tax|gst|igst|cgst|sgst|value|cost))[\s:=.]*$",
+    re.IGNORECASE,
+)
+MONEY_CONTEXT_CHARS = 20
+
+
+# --- turn a raw match into a code ---
+def _resolve_code(raw_code: str, labelled: bool) -> Optional[str]:
+    """
+    Removes separators from a matched code. After an HSN/SAC label all separators
+    join groups. Unlabelled dotted or dashed forms ('8471.30.10') are only kept
+    when the joined code is itself a master code. Unlabelled space-separated groups
+    ('8471 12 45000.00' in an invoice row) are joined only when the result is a
+    master code; otherwise the 4-digit heading is kept on its own.
+    """
+    groups = re.split(r"[ .\-]", raw_code)
+    joined = "".join(groups)
+    if labelled or len(groups) == 1:
+        return joined
+    if " " not in raw_code:
+        return joined if joined in hsn_master_data else None
+
+    for end in range(len(groups), 1, -1):
+        joined = "".join(groups[:end])
+        if joined in hsn_master_data:
+            return joined
+    return groups[0]
+
+
+def _looks_like_money(text: str, match: re.Match) -> bool:
+    """True if an unlabelled dotted number reads as an amount ('1200.00', 'Price 8471.50')."""
+    raw_code = match.group("code")
+    if "." not in raw_code:
+        return False
+    if raw_code.count(".") == 1 and raw_code.endswith(".00"):
+        return True
+    line_start = text.rfind("\n", 0, match.start()) + 1
+    before = text[max(line_start, match.start() - MONEY_CONTEXT_CHARS):match.start()]
+    return bool(MONEY_CONTEXT.search(before))
+
+
+def _is_plausible(code: str) -> bool:
+    """
+    True if an unlabelled code, or its heading/sub-heading parent, is in the master.
+    Filters out years, PIN codes and amounts; a matching chapter alone is not enough.
+    """
+    return code in hsn_master_data or (len(code) > 4 and code[:-2] in hsn_master_data)
+
+
+# --- extract candidate codes from free text ---
+def extract_hsn_codes(text: str) -> List[str]:
+    """
+    Pulls candidate HSN/SAC codes out of free text (messages, pasted invoices,
+    spreadsheet dumps) in a single pass. Separators are removed and codes are
+    returned de-duplicated in order of first appearance. Codes with a blocked
+    prefix are always kept so they can be reported as BLOCKED.
+    """
+    codes: Dict[str, None] = {}
+    for match in HSN_CODE_PATTERN.finditer(text):
+        if match.group("code"):
+            if _looks_like_money(text, match):
+                continue
+            code = _resolve_code(match.group("code"), labelled=False)
+            if code is None or not (code.startswith(BLOCKED_HSN_PREFIXES) or _is_plausible(code)):
+                continue
+        else:
+            code = _resolve_code(match.group("chapter") or match.group("labelled"), labelled=True)
+        codes.setdefault(code, None)
+    return list(codes)
+
+
+# --- extract and pre-validate ---
+def extract_and_validate_hsn_codes(text: str) -> List[Dict[str, Any]]:
+    """
+    Extracts candidate codes and pre-validates them against the master data.
+    Returns a compact list of {"code", "status"} where status is 'VALID', 'BLOCKED'
+    (policy-blocked prefix, not validated) or the validation reason_code.
+    """
+    results = []
+    for code in extract_hsn_codes(text):
+        if code.startswith(BLOCKED_HSN_PREFIXES):
+            results.append({"code": code, "status": "BLOCKED"})
+            continue
+        result = validate_hsn_code(code)
+        results.append({"code": code, "status": "VALID" if result["is_valid"] else result["reason_code"]})
+    return results
+
+
+# --- condense a long message for the LLM ---
+def condense_long_message(text: str) -> Optional[str]:
+    """
+    Returns a compact replacement for a long user message: its beginning and end
+    verbatim, with the middle replaced by the pre-validated code list. Returns None
+    if the message is short or contains no codes, so it is sent unchanged.
+    """
+    if len(text) < LONG_MESSAGE_CHARS:
+        return None
+
+    candidates = extract_and_validate_hsn_codes(text)
+    if not candidates:
+        return None
+
+    tool_ready_codes = [candidate["code"] for candidate in candidates if candidate["status"] in TOOL_READY_STATUSES]
+    return (
+        f"The user sent a long message ({len(text)} characters). Its middle part was replaced by the HSN codes extracted from it.\n"
+        f"Message start: \"{text[:MESSAGE_HEAD_CHARS]}\"\n"
+        f"Message end: \"{text[-MESSAGE_TAIL_CHARS:]}\"\n"
+        f"Extracted HSN codes, pre-validated against the master data: {candidates}\n"
+        f"Pass only these codes as 'hsn_inputs' to 'hsn_code_validation_tool' for full details: {tool_ready_codes}"
+    )
@@ -1,6 +1,141 @@
-from typing import List, Dict, Union, Any, Optional
+from typing import List, Dict, Union, Any, Optional, Iterator, MutableMapping, Tuple
 import os
-import pandas as pd
+from openpyxl import load_workbook
+
+# Header names accepted for the code and description columns (HSN and SAC sheets)
+CODE_COLUMNS = ("HSNCode", "SAC_CD")
+DESCRIPTION_COLUMNS = ("Description", "SAC_Description")
+VALID_CODE_LENGTHS = {2, 4, 6, 8}
+MAX_REJECT_SAMPLES = 100
+# Excel error values that come through as text with data_only=True
+EXCEL_ERROR_VALUES = {"#NAME?", "#REF!", "#VALUE!", "#DIV/0!", "#N/A", "#NUM!", "#NULL!", "#SPILL!", "#CALC!", "#GETTING_DATA"}
+
+
+# --- normalize a raw code cell ---
+def normalize_hsn_code(raw_code: Any) -> Optional[str]:
+    """
+    Converts a raw cell value into a clean HSN/SAC code string, or None if it is malformed.
+    Handles codes stored as numbers (which lose their leading zero in Excel) and
+    common separators such as spaces and dots (e.g. '8471 30 10', '8471.30.10').
+    """
+    if raw_code is None or isinstance(raw_code, bool):
+        return None
+
+    if isinstance(raw_code, float):
+        if not raw_code.is_integer():
+            return None
+        raw_code = int(raw_code)
+
+    if isinstance(raw_code, int):
+        code = str(raw_code)
+        # Numeric cells drop the leading zero of chapters 01-09
+        if len(code) % 2 == 1:
+            code = "0" + code
+    else:
+        code = str(raw_code).strip().replace(" ", "").replace(".", "")
+
+    if not code.isdigit() or len(code) not in VALID_CODE_LENGTHS:
+        return None
+    return code
+
+
+# --- stream rows from every sheet of the workbook ---
+def iter_hsn_rows(workbook) -> Iterator[Tuple[str, int, Any, Any]]:
+    """
+    Yields (sheet_name, row_number, raw_code, description) for every data row of every
+    sheet that has a code and a description header column (see CODE_COLUMNS and
+    DESCRIPTION_COLUMNS). Rows are read one at a time from a read-only workbook,
+    so the full table is never held in memory. Sheets without these header
+    columns (e.g. notes) are skipped.
+    """
+    for sheet in workbook.worksheets:
+        rows = sheet.iter_rows(values_only=True)
+        header = next(rows, None)
+        header = [str(cell).strip() if cell is not None else "" for cell in (header or ())]
+
+        code_index = next((header.index(name) for name in CODE_COLUMNS if name in header), None)
+        description_index = next((header.index(name) for name in DESCRIPTION_COLUMNS if name in header), None)
+
+        if code_index is None or description_index is None:
+            print(f"--- Skipping sheet '{sheet.title}': no code/description header columns. ---")
+            continue
+
+        for row_number, row in enumerate(rows, start=2):
+            raw_code = row[code_index] if code_index < len(row) else None
+            description = row[description_index] if description_index < len(row) else None
+            yield sheet.title, row_number, raw_code, description
+
+
+# --- ingest the workbook straight into a target store ---
+def ingest_hsn_workbook(file_path: str, store: MutableMapping[str, str]) -> Dict[str, Any]:
+    """
+    Streams every sheet of the HSN/SAC workbook into `store`, normalizing and
+    de-duplicating codes on the fly. A cell that already holds the exact code wins
+    over one that only matches after normalization (e.g. '2307 00' vs '230700');
+    otherwise the first occurrence wins. Rows with an empty or error-valued
+    description (e.g. '#NAME?') are rejected.
+    Returns a report with counts and a bounded sample of rejected rows.
+    """
+    report = {
+        "sheets": [],  # sheets that were actually ingested
+        "loaded": 0,
+        "duplicates": 0,
+        "malformed": 0,
+        "rejects": [],
+    }
+
+    def reject(sheet_name, row_number, raw_code, reason):
+        report["duplicates" if reason == "DUPLICATE_CODE" else "malformed"] += 1
+        if len(report["rejects"]) < MAX_REJECT_SAMPLES:
+            report["rejects"].append({
+                "sheet": sheet_name,
+                "row": row_number,
+                "input_hsn": str(raw_code),
+                "reason_code": reason,
+            })
+
+    # Codes stored from a cell that only matched after normalization, with their origin row
+    normalized_rows: Dict[str, Tuple[str, int, Any]] = {}
+
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        for sheet_name, row_number, raw_code, description in iter_hsn_rows(workbook):
+            if raw_code is None and description is None:
+                continue  # blank row
+
+            code = normalize_hsn_code(raw_code)
+            if code is None:
+                reject(sheet_name, row_number, raw_code, "MALFORMED_CODE")
+                continue
+
+            description = str(description).strip() if description is not None else ""
+            if not description or description in EXCEL_ERROR_VALUES:
+                reject(sheet_name, row_number, raw_code, "MALFORMED_DESCRIPTION")
+                continue
+
+            raw_text = str(int(raw_code)) if isinstance(raw_code, (int, float)) else str(raw_code).strip()
+            is_exact = raw_text == code
+
+            if code in store:
+                if is_exact and code in normalized_rows:
+                    # The exact cell replaces the earlier normalized one, which becomes the duplicate
+                    reject(*normalized_rows.pop(code), "DUPLICATE_CODE")
+                    store[code] = description
+                else:
+                    reject(sheet_name, row_number, raw_code, "DUPLICATE_CODE")
+                continue
+
+            store[code] = description
+            report["loaded"] += 1
+            if not report["sheets"] or report["sheets"][-1] != sheet_name:
+                report["sheets"].append(sheet_name)  # only sheets that contributed codes
+            if not is_exact:
+                normalized_rows[code] = (sheet_name, row_number, raw_code)
+    finally:
+        workbook.close()
+
+    return report
+
 
 # --- load the hsn data file  ---
 def load_hsn_data(file_path: str) -> Dict[str, str]:
@@ -12,27 +147,24 @@ def load_hsn_data(file_path: str) -> Dict[str, str]:
         print(f"--- CRITICAL ERROR: HSN master file not found at '{file_path}'. The validation tool will be non-functional. ---")
         return {}
 
+    hsn_map: Dict[str, str] = {}
     try:
-        df = pd.read_excel(file_path, dtype={'HSNCode': str})
-
-        if 'HSNCode' not in df.columns or 'Description' not in df.columns:
-            print("--- CRITICAL ERROR: Excel file must contain 'HSNCode' and 'Description' columns. ---")
-            return {}
-
-        df.dropna(subset=['HSNCode'], inplace=True)
-        df['HSNCode'] = df['HSNCode'].str.strip()
-        hsn_map = pd.Series(df.Description.values, index=df.HSNCode).to_dict()
-        
-        print(f"--- Successfully loaded {len(hsn_map)} HSN codes into memory. ---")
-        return hsn_map
-
+        report = ingest_hsn_workbook(file_path, hsn_map)
     except Exception as e:
         print(f"--- CRITICAL ERROR: An error occurred while reading the Excel file: {e} ---")
         return {}
-    
+
+    if not hsn_map:
+        print(f"--- CRITICAL ERROR: Excel file must contain sheets with {CODE_COLUMNS} and {DESCRIPTION_COLUMNS} columns. ---")
+        return {}
+
+    print(f"--- Successfully loaded {len(hsn_map)} HSN codes into memory from {len(report['sheets'])} sheet(s). ---")
+    if report["duplicates"] or report["malformed"]:
+        print(f"--- Rejected {report['duplicates']} duplicate and {report['malformed']} malformed (code or description) rows. Sample: {report['rejects'][:5]} ---")
+    return hsn_map
+
 # Load the data into a global variable as our in-memory data store.
-script_dir = os.path.dirname(__file__) 
+script_dir = os.path.dirname(__file__)
 file_path = os.path.join(script_dir, "..", "data", "HSN_SAC.xlsx")
 file_path = os.path.abspath(file_path)
 hsn_master_data = load_hsn_data(file_path)
-
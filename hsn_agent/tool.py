@@ -1,12 +1,69 @@
 from google.adk.tools.tool_context import ToolContext
 from typing import List, Dict, Union, Any, Optional
 from .data_loader import hsn_master_data
+from .access_log import record_hsn_access
+
+# HSN code prefixes blocked by policy (enforced by block_hsn_code_tool_guardrail)
+BLOCKED_HSN_PREFIXES = ("12345",)
+
+
+# --- Validate a single HSN code ---
+def validate_hsn_code(code: Any) -> Dict[str, Any]:
+    """
+    Validates a single HSN code against the pre-loaded HSN master data and returns
+    the result dictionary. Shared by the validation tool and the answer table build.
+    """
+    if not isinstance(code, str):
+        return {"input_hsn": str(code), "is_valid": False, "reason_code": "INVALID_ITEM_TYPE", "message": "Each HSN code must be a string."}
+
+    clean_code = code.strip()
+
+    if not clean_code.isdigit() or len(clean_code) not in {2, 4, 6, 8}:
+        return {"input_hsn": code, "is_valid": False, "reason_code": "INVALID_FORMAT", "message": "HSN code must be numeric and 2, 4, 6, or 8 digits long."}
+
+    # This is now an extremely fast lookup in the in-memory dictionary
+    description = hsn_master_data.get(clean_code)
+
+    if description:
+        return {"input_hsn": code, "is_valid": True, "description": description, "message": "HSN code is valid."}
+
+    # --- Hierarchical Validation Logic ---
+    # Check for parents of an 8-digit or 6-digit code
+    if len(clean_code) in [6, 8]:
+        parent_code = clean_code[:-2]  # Check for 6-digit or 4-digit parent
+        parent_description = hsn_master_data.get(parent_code)
+        if parent_description:
+            return {
+                "input_hsn": code,
+                "is_valid": False,
+                "reason_code": "NOT_FOUND_BUT_PARENT_EXISTS",
+                "message": f"HSN Code not found, but its parent category '{parent_code}' ({parent_description}) is valid."
+            }
+    # Check for the 2-digit chapter of a 4-digit code if no other parent was found
+    if len(clean_code) >= 4:
+        parent_code = clean_code[:2]  # Check for 2-digit chapter
+        parent_description = hsn_master_data.get(parent_code)
+        if parent_description:
+            return {
+                "input_hsn": code,
+                "is_valid": False,
+                "reason_code": "NOT_FOUND_BUT_PARENT_EXISTS",
+                "message": f"HSN Code not found, but its parent chapter '{parent_code}' ({parent_description}) is valid."
+            }
+
+    return {
+        "input_hsn": code,
+        "is_valid": False,
+        "reason_code": "NOT_FOUND",
+        "message": "HSN code not found in master data, and no valid parent category was found."
+    }
+
 
 # --- Initialize the tool for agent ---
 def hsn_code_validation_tool(hsn_inputs: List[str], tool_context:ToolContext) -> List[Dict[str, Any]]:
     """
     Validates one or more HSN codes against the pre-loaded HSN master data.
-    This tool should be used for all HSN validation requests. It takes either a 
+    This tool should be used for all HSN validation requests. It takes either a
     single HSN code as a string or a list of HSN codes as strings.
     """
     print(f"--- Tool 'hsn_code_validation_tool' called with: {hsn_inputs} ---")
@@ -28,62 +85,16 @@ def hsn_code_validation_tool(hsn_inputs: List[str], tool_context:ToolContext) ->
             "message": "Input must be a list of strings."
         }]
 
-    results = []
-    for code in hsn_inputs:
-        # Perform all validation checks as before
-        if not isinstance(code, str):
-            results.append({"input_hsn": str(code), "is_valid": False, "reason_code": "INVALID_ITEM_TYPE", "message": "Each HSN code must be a string."})
-            continue
-
-        clean_code = code.strip()
-
-        if not clean_code.isdigit() or len(clean_code) not in {2, 4, 6, 8}:
-            results.append({"input_hsn": code, "is_valid": False, "reason_code": "INVALID_FORMAT", "message": "HSN code must be numeric and 2, 4, 6, or 8 digits long."})
-            continue
-
-        # This is now an extremely fast lookup in the in-memory dictionary
-        description = hsn_master_data.get(clean_code)
-
-        if description:
-            results.append({"input_hsn": code, "is_valid": True, "description": description, "message": "HSN code is valid."})
-        else:
-            # --- Hierarchical Validation Logic ---
-            parent_found = False
-            # Check for parents of an 8-digit or 6-digit code
-            if len(clean_code) in [6, 8]:
-                parent_code = clean_code[:-2]  # Check for 6-digit or 4-digit parent
-                parent_description = hsn_master_data.get(parent_code)
-                if parent_description:
-                    results.append({
-                        "input_hsn": code,
-                        "is_valid": False,
-                        "reason_code": "NOT_FOUND_BUT_PARENT_EXISTS",
-                        "message": f"HSN Code not found, but its parent category '{parent_code}' ({parent_description}) is valid."
-                    })
-                    parent_found = True
-            # Check for the 2-digit chapter of a 4-digit code if no other parent was found
-            if not parent_found and len(clean_code) >= 4:
-                parent_code = clean_code[:2]  # Check for 2-digit chapter
-                parent_description = hsn_master_data.get(parent_code)
-                if parent_description:
-                    results.append({
-                        "input_hsn": code,
-                        "is_valid": False,
-                        "reason_code": "NOT_FOUND_BUT_PARENT_EXISTS",
-                        "message": f"HSN Code not found, but its parent chapter '{parent_code}' ({parent_description}) is valid."
-                    })
-                    parent_found = True
-
-            if not parent_found:
-                results.append({
-                    "input_hsn": code,
-                    "is_valid": False,
-                    "reason_code": "NOT_FOUND",
-                    "message": "HSN code not found in master data, and no valid parent category was found."
-                })
+    results = [validate_hsn_code(code) for code in hsn_inputs]
+
+    # Log well-formed codes so the offline answer table build knows what is popular
+    record_hsn_access([
+        result["input_hsn"].strip() for result in results
+        if result.get("reason_code") not in {"INVALID_ITEM_TYPE", "INVALID_FORMAT"}
+    ])
 
     tool_context.state["hsn_tool_last_result"] = results
     print("--- Agent Tool Result ---")
     print(results)
 
-    return results
\ No newline at end of file
+    return results
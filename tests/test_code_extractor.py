@@ -0,0 +1,52 @@
+import pytest
+
+from hsn_agent.code_extractor import condense_long_message, extract_and_validate_hsn_codes, extract_hsn_codes
+
+
+@pytest.mark.parametrize("text, expected", [
+    # spaced, dotted and dashed codes
+    ("1\t8471 30 10\tLaptop", ["84713010"]),
+    ("8471.30.10 and 8471-30", ["84713010", "847130"]),
+    ("Laptop 8471 12 45000.00", ["8471"]),
+    ("Phone 8517 10 15000", ["8517"]),
+    ("Qty 1200 50 pcs", []),
+    ("0101.21.00", ["01012100"]),
+    # tab-separated columns
+    ("Sl\tHSN\tItem\tQty\n1\t85176290\tRouter\t5\n2\t9954\tConstruction\t1", ["85176290", "9954"]),
+    # dates, GSTINs, PIN codes and amounts
+    ("12/05/2024 12-05-2024 2024-05-12", []),
+    ("GSTIN 29ABCDE1234F1Z5", []),
+    ("year 2024, PIN 560001", []),
+    ("Unit price 8471.50 Total 1200.00 Tax 3004.20", []),
+    ("Total: 8517.00", []),
+    ("HSN 8471 Qty 2 Rate 8504.00", ["8471"]),
+    ("1200,000 and 1,25,000.00", []),
+    # comma-separated lists
+    ("8471,8528,8517", ["8471", "8528", "8517"]),
+    ("HSN: 8471,8528", ["8471", "8528"]),
+    # labelled codes and chapters
+    ("hsn-8471", ["8471"]),
+    ("HSN Code: 1234 56, chapter 85, SAC 99", ["123456", "85", "99"]),
+    ("12 items in 85 boxes", []),
+    # de-duplication keeps first appearance
+    ("8471 30 10, 84713010, 8471.30.10", ["84713010"]),
+])
+def test_extract_hsn_codes(text, expected):
+    assert extract_hsn_codes(text) == expected
+
+
+def test_blocked_prefix_is_reported_not_validated():
+    assert extract_and_validate_hsn_codes("12345678, 84713010") == [
+        {"code": "12345678", "status": "BLOCKED"},
+        {"code": "84713010", "status": "VALID"},
+    ]
+
+
+def test_condense_long_message_keeps_question_and_skips_code_free_text():
+    invoice = "Please check my invoice:\n" + "1\t8471 30 10\tLaptop\t2\t1,25,000.00\n" * 40 + "Which of these are misclassified?"
+    condensed = condense_long_message(invoice)
+    assert "Which of these are misclassified?" in condensed
+    assert "['84713010']" in condensed
+
+    assert condense_long_message("no codes here. " * 100) is None
+    assert condense_long_message("HSN 8471") is None